@@ -0,0 +1,56 @@
+import argparse
+import random
+import time
+import numpy as np
+from spatial_index import KDTreeIndex
+
+def make_uniform(n: int, rng: random.Random):
+    return {i: (rng.uniform(0, 1e6), rng.uniform(0, 1e6)) for i in range(n)}
+
+def make_clustered(n: int, rng: random.Random, city_share: float = 0.95):
+    # Sebagian besar node padat di satu "kota", sisanya tersebar di area luas
+    city = int(n * city_share)
+    pos = {i: (rng.gauss(5e5, 2e3), rng.gauss(5e5, 2e3)) for i in range(city)}
+    pos.update({i: (rng.uniform(0, 1e7), rng.uniform(0, 1e7)) for i in range(city, n)})
+    return pos
+
+def bench(name: str, pos, queries, verify: int):
+    t = time.perf_counter()
+    index = KDTreeIndex(pos)
+    build = time.perf_counter() - t
+
+    ids = np.fromiter(pos.keys(), dtype=np.int64, count=len(pos))
+    coords = np.array(list(pos.values()))
+    for label, points in queries.items():
+        t = time.perf_counter()
+        results = [index.nearest(x, y) for x, y in points]
+        per_query_ms = (time.perf_counter() - t) * 1000 / len(points)
+
+        # Verifikasi brute force untuk sebagian query
+        for (x, y), (node, dist) in list(zip(points, results))[:verify]:
+            d = np.hypot(coords[:, 0] - x, coords[:, 1] - y)
+            assert abs(d.min() - dist) < 1e-6, (label, x, y, node, ids[d.argmin()])
+
+        print(f"{name:<10} | {label:<14} | build {build:6.2f} s | {per_query_ms:.4f} ms/query")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark KDTreeIndex nearest-node queries")
+    parser.add_argument("-n", "--nodes", type=int, default=1_000_000)
+    parser.add_argument("-q", "--queries", type=int, default=2000)
+    parser.add_argument("--verify", type=int, default=50, help="Queries checked against brute force")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    q = args.queries
+    bench("uniform", make_uniform(args.nodes, rng), {
+        "inside": [(rng.uniform(0, 1e6), rng.uniform(0, 1e6)) for _ in range(q)],
+        "outside bbox": [(rng.uniform(-5e6, -1e6), rng.uniform(-5e6, 6e6)) for _ in range(q)],
+    }, args.verify)
+    bench("clustered", make_clustered(args.nodes, rng), {
+        "in city": [(rng.gauss(5e5, 2e3), rng.gauss(5e5, 2e3)) for _ in range(q)],
+        "sparse area": [(rng.uniform(0, 1e7), rng.uniform(0, 1e7)) for _ in range(q)],
+        "outside bbox": [(rng.uniform(-5e7, -1e7), rng.uniform(-5e7, 5e7)) for _ in range(q)],
+    }, args.verify)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
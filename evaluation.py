@@ -0,0 +1,79 @@
+from typing import List, NamedTuple, TYPE_CHECKING
+import itertools
+import numpy as np
+
+if TYPE_CHECKING:
+    from path_solution import PathSolution
+    from graph_handler import GraphHandler
+
+_HASH_BASE = np.uint64(0x100000001B3)
+
+class BatchEvaluation(NamedTuple):
+    lengths: np.ndarray   # float64, inf jika path melewati edge yang tidak ada
+    fitness: np.ndarray   # float64, 1 / length (Eq. 4)
+    feasible: np.ndarray  # bool, length <= (1 + epsilon) * shortest path
+    hashes: np.ndarray    # uint64, hash urutan node per path
+
+def _mix64(x: np.ndarray) -> np.ndarray:
+    # Finalizer splitmix64 agar node ID yang berdekatan tersebar merata
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+def evaluate_batch(paths: List['PathSolution'], graph_handler: 'GraphHandler', max_allowed: float) -> BatchEvaluation:
+    """
+    Evaluates a whole generation at once: node sequences are packed into one flat array with offsets,
+    edge weights are looked up in bulk and lengths, fitness, feasibility and hashes are computed vectorized.
+    Also writes `length`, `fitness` and `path_hash` back onto each PathSolution.
+    """
+    num_paths = len(paths)
+    if num_paths == 0:
+        empty = np.empty(0)
+        return BatchEvaluation(empty, empty, empty.astype(bool), empty.astype(np.uint64))
+
+    # 1. Pack: flat node array + offsets
+    counts = np.fromiter((len(p.nodes) for p in paths), dtype=np.int64, count=num_paths)
+    offsets = np.zeros(num_paths + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    flat = np.fromiter(itertools.chain.from_iterable(p.nodes for p in paths), dtype=np.int64, count=int(offsets[-1]))
+    path_of_node = np.repeat(np.arange(num_paths), counts)
+
+    # 2. Bulk edge-weight lookup (edge i menghubungkan flat[i] -> flat[i+1] dalam path yang sama)
+    node_ids, edge_keys, edge_weights = graph_handler.get_edge_table()
+    n = len(node_ids)
+    idx = np.minimum(np.searchsorted(node_ids, flat), max(n - 1, 0))
+    known = node_ids[idx] == flat if n else np.zeros(len(flat), dtype=bool)
+
+    internal = path_of_node[1:] == path_of_node[:-1]
+    keys = idx[:-1][internal] * n + idx[1:][internal]
+    found = known[:-1][internal] & known[1:][internal]
+    if len(edge_keys):
+        pos = np.minimum(np.searchsorted(edge_keys, keys), len(edge_keys) - 1)
+        found &= edge_keys[pos] == keys
+        weights = np.where(found, edge_weights[pos], np.inf)
+    else:
+        weights = np.full(len(keys), np.inf)
+
+    # 3. Length, fitness, feasibility
+    lengths = np.bincount(path_of_node[1:][internal], weights=weights, minlength=num_paths)
+    valid = np.isfinite(lengths) & (lengths > 0)
+    fitness = np.divide(1.0, lengths, out=np.zeros(num_paths), where=valid)
+    feasible = lengths <= max_allowed
+
+    # 4. Polynomial hash atas urutan node (mod 2^64), dicampur dengan panjang path
+    position = np.arange(len(flat), dtype=np.int64) - offsets[:-1][path_of_node]
+    terms = _mix64(flat.astype(np.uint64) + np.uint64(1)) * (_HASH_BASE ** position.astype(np.uint64))
+    hashes = np.zeros(num_paths, dtype=np.uint64)
+    non_empty = counts > 0
+    if non_empty.any():
+        hashes[non_empty] = np.add.reduceat(terms, offsets[:-1][non_empty])
+    hashes ^= _mix64(counts.astype(np.uint64))
+
+    for p, length, fit, path_hash in zip(paths, lengths.tolist(), fitness.tolist(), hashes.tolist()):
+        p.length = length
+        p.fitness = fit
+        p.path_hash = path_hash
+
+    return BatchEvaluation(lengths, fitness, feasible, hashes)
\ No newline at end of file
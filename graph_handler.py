@@ -1,13 +1,34 @@
-import networkx as nx
-import pandas as pd
+import itertools
 import math
-from typing import List, Dict, Tuple
+import sys
+from typing import Any, Iterable, Iterator, List, Dict, Optional, Tuple
+from spatial_index import KDTreeIndex
+
+# networkx dan pandas di-import secara lazy di dalam method agar
+# mode inspeksi dan worker yang baru di-spawn tidak membayar biaya import-nya.
+
+def _peak_memory_mb() -> float:
+    # Peak RSS proses; modul resource tidak tersedia di Windows
+    try:
+        import resource
+    except ImportError:
+        return float('nan')
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS melaporkan byte
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
 
 class GraphHandler:
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, chunk_size: int = 100_000):
+        import networkx as nx
+
         self.graph = nx.Graph()
         self.pos: Dict[int, Tuple[float, float]] = {} # Menyimpan koordinat asli (x,y)
         self.node_mapping: Dict[Tuple[float, float], int] = {} # Mapping (x,y) -> Node ID
+        self.chunk_size = chunk_size # Jumlah baris per chunk saat streaming CSV (batas memori)
+        self.peak_memory_mb = 0.0
+        self._spatial_index: Optional[KDTreeIndex] = None # Dibangun saat snapping pertama
+        self.weight_version = 0 # Bertambah setiap kali update_edge_weights mengubah bobot edge
+        self._edge_table: Optional[Tuple[Any, Any, Any]] = None # Cache array untuk evaluasi batch
 
         if file_path.endswith('.xlsx') or file_path.endswith('.xls'):
             self._load_from_excel(file_path)
@@ -16,17 +37,62 @@ class GraphHandler:
         else:
             self._load_from_edgelist(file_path)
             
-        print(f"Graph loaded: {self.graph.number_of_nodes()} nodes, {self.graph.number_of_edges()} edges.")
+        self.peak_memory_mb = _peak_memory_mb()
+        print(f"Graph loaded: {self.graph.number_of_nodes()} nodes, {self.graph.number_of_edges()} edges. Peak memory: {self.peak_memory_mb:.1f} MB")
 
-    def _process_dataframe(self, df):
+    @staticmethod
+    def inspect(file_path: str, chunk_size: int = 100_000, sample_size: int = 10) -> Dict[str, Any]:
+        """
+        Scans an edge file for node/edge counts and sample node IDs without building a NetworkX graph.
+        Node IDs are assigned in the same order as the full loader, so they can be passed to -S/-T.
+        """
+        edges = set()
+        if file_path.endswith(('.xlsx', '.xls', '.csv')):
+            node_mapping: Dict[Tuple[float, float], int] = {}
+            for chunk in GraphHandler._read_table_chunks(file_path, chunk_size):
+                for start_coord, end_coord, _ in GraphHandler._iter_edge_rows(chunk):
+                    u = node_mapping.setdefault(start_coord, len(node_mapping))
+                    v = node_mapping.setdefault(end_coord, len(node_mapping))
+                    edges.add((u, v) if u <= v else (v, u))
+            num_nodes = len(node_mapping)
+            samples = list(itertools.islice(node_mapping.items(), sample_size))
+        else:
+            nodes = set()
+            with open(file_path) as f:
+                for line in f:
+                    fields = line.split('#', 1)[0].split()
+                    if len(fields) < 2:
+                        continue
+                    u, v = int(fields[0]), int(fields[1])
+                    nodes.update((u, v))
+                    edges.add((u, v) if u <= v else (v, u))
+            num_nodes = len(nodes)
+            samples = []
+
+        return {'nodes': num_nodes, 'edges': len(edges), 'samples': samples}
+
+    @staticmethod
+    def _read_table_chunks(file_path: str, chunk_size: int) -> Iterator[Any]:
+        # Excel dibaca sekaligus; CSV di-stream per chunk sehingga tabel penuh tidak pernah dimuat
+        import pandas as pd
+
+        if file_path.endswith('.xlsx') or file_path.endswith('.xls'):
+            yield pd.read_excel(file_path, header=0)
+        else:
+            with pd.read_csv(file_path, header=0, chunksize=chunk_size) as reader:
+                yield from reader
+
+    @staticmethod
+    def _iter_edge_rows(df) -> Iterator[Tuple[Tuple[float, float], Tuple[float, float], float]]:
+        """
+        Yields (start_coord, end_coord, distance) for each valid row of an edge table (or chunk).
+        """
         # Helper untuk konversi string angka koma ke float
         def clean_float(val):
             if isinstance(val, str):
                 val = val.replace(',', '.')
             return float(val)
 
-        next_node_id = 0
-        
         # Deteksi nama kolom (adaptasi untuk variasi format)
         cols = df.columns.str.lower()
         if 'startnode_x' in cols: # Format CSV Arizona
@@ -38,51 +104,57 @@ class GraphHandler:
             c_ex, c_ey = df.columns[2], df.columns[3]
             c_dist = df.columns[4]
 
-        for _, row in df.iterrows():
+        try:
+            columns = (df[c_sx], df[c_sy], df[c_ex], df[c_ey], df[c_dist])
+        except KeyError:
+            return
+
+        for sx, sy, ex, ey, dist in zip(*columns):
             try:
-                sx, sy = clean_float(row[c_sx]), clean_float(row[c_sy])
-                ex, ey = clean_float(row[c_ex]), clean_float(row[c_ey])
-                dist = clean_float(row[c_dist])
-                
-                start_coord = (sx, sy)
-                end_coord = (ex, ey)
-
-                # Assign Node ID untuk Start Node
-                if start_coord not in self.node_mapping:
-                    self.node_mapping[start_coord] = next_node_id
-                    self.pos[next_node_id] = start_coord
-                    next_node_id += 1
-                
-                # Assign Node ID untuk End Node
-                if end_coord not in self.node_mapping:
-                    self.node_mapping[end_coord] = next_node_id
-                    self.pos[next_node_id] = end_coord
-                    next_node_id += 1
-                
-                # Tambah Edge
-                u = self.node_mapping[start_coord]
-                v = self.node_mapping[end_coord]
-                
-                self.graph.add_edge(u, v, weight=dist)
-                
-            except (ValueError, KeyError):
+                yield (clean_float(sx), clean_float(sy)), (clean_float(ex), clean_float(ey)), clean_float(dist)
+            except ValueError:
                 continue
 
+    def _process_dataframe(self, df):
+        # Node ID dilanjutkan dari chunk sebelumnya (streaming)
+        next_node_id = len(self.node_mapping)
+
+        for start_coord, end_coord, dist in self._iter_edge_rows(df):
+            # Assign Node ID untuk Start Node
+            if start_coord not in self.node_mapping:
+                self.node_mapping[start_coord] = next_node_id
+                self.pos[next_node_id] = start_coord
+                next_node_id += 1
+            
+            # Assign Node ID untuk End Node
+            if end_coord not in self.node_mapping:
+                self.node_mapping[end_coord] = next_node_id
+                self.pos[next_node_id] = end_coord
+                next_node_id += 1
+            
+            # Tambah Edge
+            u = self.node_mapping[start_coord]
+            v = self.node_mapping[end_coord]
+            
+            self.graph.add_edge(u, v, weight=dist)
+
     def _load_from_excel(self, file_path: str):
         try:
-            df = pd.read_excel(file_path, header=0)
-            self._process_dataframe(df)
+            for df in self._read_table_chunks(file_path, self.chunk_size):
+                self._process_dataframe(df)
         except Exception as e:
             print(f"Error reading Excel: {e}")
 
     def _load_from_csv(self, file_path: str):
         try:
-            df = pd.read_csv(file_path, header=0)
-            self._process_dataframe(df)
+            for chunk in self._read_table_chunks(file_path, self.chunk_size):
+                self._process_dataframe(chunk)
         except Exception as e:
             print(f"Error reading CSV: {e}")
 
     def _load_from_edgelist(self, file_path: str):
+        import networkx as nx
+
         try:
             self.graph = nx.read_edgelist(file_path, nodetype=int, data=(("weight", float),))
         except TypeError:
@@ -96,6 +168,80 @@ class GraphHandler:
         except KeyError:
             return float('inf')
 
+    def update_edge_weights(self, updates: Iterable[Tuple[int, int, float]]) -> int:
+        """
+        Applies a batch of (u, v, new_weight) changes to existing edges.
+        Unknown edges are skipped; if an edge appears more than once (in either direction)
+        the last update wins. Returns the number of distinct edges updated.
+        """
+        # Graf tidak berarah: gabungkan update per edge kanonik (min, max) agar tabel edge selaras dengan graf
+        applied: Dict[Tuple[int, int], float] = {}
+        for u, v, weight in updates:
+            if self.graph.has_edge(u, v):
+                self.graph[u][v]['weight'] = weight
+                applied[(u, v) if u <= v else (v, u)] = weight
+
+        if self._edge_table is not None and applied:
+            # Patch tabel edge di tempat (kedua arah) tanpa membangun ulang
+            import numpy as np
+
+            node_ids, edge_keys, edge_weights = self._edge_table
+            us, vs = (np.array(col) for col in zip(*applied.keys()))
+            weights = np.array(list(applied.values()))
+            iu = np.searchsorted(node_ids, us)
+            iv = np.searchsorted(node_ids, vs)
+            n = len(node_ids)
+            edge_weights[np.searchsorted(edge_keys, iu * n + iv)] = weights
+            edge_weights[np.searchsorted(edge_keys, iv * n + iu)] = weights
+
+        if applied:
+            self.weight_version += 1
+        return len(applied)
+
+    def get_edge_table(self) -> Tuple[Any, Any, Any]:
+        """
+        Returns (node_ids, edge_keys, edge_weights) numpy arrays for vectorized weight lookup.
+        node_ids is sorted; each edge is stored in both directions under key index(u) * n + index(v),
+        with edge_keys sorted so lookups use np.searchsorted.
+        """
+        if self._edge_table is None:
+            import numpy as np
+
+            node_ids = np.array(sorted(self.graph.nodes()), dtype=np.int64)
+            num_edges = self.graph.number_of_edges()
+            us = np.empty(num_edges, dtype=np.int64)
+            vs = np.empty(num_edges, dtype=np.int64)
+            weights = np.empty(num_edges, dtype=np.float64)
+            for i, (u, v, w) in enumerate(self.graph.edges(data='weight', default=float('inf'))):
+                us[i], vs[i], weights[i] = u, v, w
+
+            n = len(node_ids)
+            iu = np.searchsorted(node_ids, us)
+            iv = np.searchsorted(node_ids, vs)
+            keys = np.concatenate([iu * n + iv, iv * n + iu])
+            order = np.argsort(keys, kind='stable')
+            self._edge_table = (node_ids, keys[order], np.concatenate([weights, weights])[order])
+        return self._edge_table
+
+    @property
+    def spatial_index(self) -> KDTreeIndex:
+        if self._spatial_index is None:
+            self._spatial_index = KDTreeIndex(self.pos)
+        return self._spatial_index
+
+    def snap_to_node(self, x: float, y: float, max_distance: Optional[float] = None) -> Optional[Tuple[int, float]]:
+        """
+        Returns (node_id, distance) of the node nearest to coordinate (x, y).
+        None if the graph has no coordinates or the nearest node is farther than `max_distance`.
+        """
+        result = self.spatial_index.nearest(x, y)
+        if result is None or (max_distance is not None and result[1] > max_distance):
+            return None
+        return result
+
+    def get_nodes_within(self, x: float, y: float, radius: float) -> List[Tuple[int, float]]:
+        return self.spatial_index.within_radius(x, y, radius)
+
     def get_neighbors(self, node: int) -> List[int]:
         return list(self.graph.neighbors(node))
     
@@ -103,6 +249,8 @@ class GraphHandler:
         return list(self.graph.nodes())
 
     def get_shortest_path_length(self, S: int, T: int) -> float:
+        import networkx as nx
+
         try:
             return nx.shortest_path_length(self.graph, source=S, target=T, weight='weight')
         except nx.NetworkXNoPath:
@@ -1,7 +1,7 @@
-from typing import List
+from typing import List, Optional
 import random
 from path_solution import PathSolution
-from operators import lfpc_crossover, lfpc_mutation
+from operators import BridgeCache, lfpc_crossover, lfpc_mutation
 
 class Island:
     def __init__(self, superior_pop: List[PathSolution], central_pop: List[PathSolution]):
@@ -9,7 +9,7 @@ class Island:
         self.P_cp = central_pop
         self.all_parents = list(set(superior_pop + central_pop))
 
-    def generate_offspring(self, graph_handler, mutation_prob: float) -> List[PathSolution]:
+    def generate_offspring(self, graph_handler, mutation_prob: float, bridge_cache: Optional[BridgeCache] = None) -> List[PathSolution]:
         new_offspring_list = []
         if not self.P_sp or not self.P_cp:
             return []
@@ -26,9 +26,9 @@ class Island:
             parent_A = random.choices(self.P_sp, weights=weights, k=1)[0]
             
             if random.random() < mutation_prob:
-                c1, c2 = lfpc_mutation(parent_A, parent_B, graph_handler)
+                c1, c2 = lfpc_mutation(parent_A, parent_B, graph_handler, bridge_cache)
             else:
-                c1, c2 = lfpc_crossover(parent_A, parent_B, graph_handler)
+                c1, c2 = lfpc_crossover(parent_A, parent_B, graph_handler, bridge_cache)
             
             new_offspring_list.extend([c1, c2])
             
@@ -1,15 +1,16 @@
 import argparse
-import networkx as nx
-import plotly.graph_objects as go
 import os
 import random
 from graph_handler import GraphHandler
-from mibga import MIBGA
 
 def visualize_paths_plotly(graph_handler, final_paths, candidate_paths, S, T):
     """
     Visualisasi Interaktif menggunakan Plotly.
     """
+    # Import lazy: mode inspeksi dan mode headless tidak pernah memuat plotly
+    import networkx as nx
+    import plotly.graph_objects as go
+
     G = graph_handler.graph
     pos = graph_handler.pos if graph_handler.pos else nx.spring_layout(G, seed=42)
     
@@ -104,14 +105,28 @@ def visualize_paths_plotly(graph_handler, final_paths, candidate_paths, S, T):
     
     fig.show()
 
+def print_paths(final_paths):
+    """
+    Ringkasan jalur solusi untuk mode headless (tanpa Plotly).
+    """
+    for i, path in enumerate(final_paths):
+        print(f"Path {i+1} (Len: {path.length:.2f}): {' -> '.join(map(str, path.nodes))}")
+
 def main():
     parser = argparse.ArgumentParser(description="MIBGA Application")
     parser.add_argument("graph_file", type=str, help="Path to Excel (.xlsx), CSV (.csv) or edgelist file")
     
-    parser.add_argument("-S", "--start", type=int, required=False, help="Source Node ID")
-    parser.add_argument("-T", "--target", type=int, required=False, help="Target Node ID")
+    start_group = parser.add_mutually_exclusive_group()
+    start_group.add_argument("-S", "--start", type=int, required=False, help="Source Node ID")
+    start_group.add_argument("--start_xy", type=float, nargs=2, metavar=("X", "Y"), help="Source coordinate, snapped to the nearest node")
+    target_group = parser.add_mutually_exclusive_group()
+    target_group.add_argument("-T", "--target", type=int, required=False, help="Target Node ID")
+    target_group.add_argument("--target_xy", type=float, nargs=2, metavar=("X", "Y"), help="Target coordinate, snapped to the nearest node")
+    parser.add_argument("--snap_radius", type=float, default=None, help="Maximum snapping distance for --start_xy/--target_xy")
     parser.add_argument("-K", "--k_paths", type=int, default=3, help="K paths")
     parser.add_argument("-e", "--epsilon", type=float, default=0.2, help="Epsilon threshold")
+    parser.add_argument("--chunk_size", type=int, default=100_000, help="Rows per chunk when streaming CSV input")
+    parser.add_argument("--headless", action="store_true", help="Print result paths instead of opening the Plotly visualization")
     
     args = parser.parse_args()
 
@@ -119,38 +134,37 @@ def main():
         print(f"\n[ERROR] File tidak ditemukan: {args.graph_file}")
         return
 
-    # 1. Load Graph
-    try:
-        gh = GraphHandler(args.graph_file)
-    except Exception as e:
-        print(f"Error loading graph: {e}")
-        return
+    # 1. LOGIKA MODE INSPEKSI (Jika user tidak memberi argumen S dan T)
+    # Hanya memindai file, tanpa membangun graf NetworkX
+    has_start = args.start is not None or args.start_xy is not None
+    has_target = args.target is not None or args.target_xy is not None
+    if not has_start or not has_target:
+        try:
+            info = GraphHandler.inspect(args.graph_file, chunk_size=args.chunk_size)
+        except Exception as e:
+            print(f"Error loading graph: {e}")
+            return
 
-    # 2. LOGIKA MODE INSPEKSI (Jika user tidak memberi argumen S dan T)
-    if args.start is None or args.target is None:
         filename = os.path.basename(args.graph_file)
         print("\n" + "="*50)
         print(f" INFO GRAF: {filename}")
         print("="*50)
-        print(f"Total Nodes : {gh.graph.number_of_nodes()}")
-        print(f"Total Edges : {gh.graph.number_of_edges()}")
+        print(f"Total Nodes : {info['nodes']}")
+        print(f"Total Edges : {info['edges']}")
         
-        if hasattr(gh, 'node_mapping') and gh.node_mapping:
+        if info['samples']:
             print("\n[SAMPEL NODE ID]")
             print("-" * 65)
             print(f"{'Koordinat (X, Y)':<45} | {'Node ID':<10}")
             print("-" * 65)
             
-            count = 0
-            sample_ids = list(gh.node_mapping.values())
-            example_s = sample_ids[0] if len(sample_ids) > 0 else 0
-            example_t = sample_ids[5] if len(sample_ids) > 5 else (sample_ids[-1] if sample_ids else 0)
+            sample_ids = [nid for _, nid in info['samples']]
+            example_s = sample_ids[0]
+            example_t = sample_ids[5] if len(sample_ids) > 5 else sample_ids[-1]
 
-            for coord, nid in gh.node_mapping.items():
+            for coord, nid in info['samples']:
                 coord_str = f"({coord[0]:.2f}, {coord[1]:.2f})"
                 print(f"{coord_str:<45} | {nid:<10}")
-                count += 1
-                if count >= 10: break
             print("-" * 65)
             
             print(f"\nTIP: Gunakan Node ID di atas.")
@@ -160,7 +174,31 @@ def main():
             print("Node ID adalah angka integer yang ada di dalam file Anda.")
         return
 
-    # 3. LOGIKA MODE EKSEKUSI
+    # 2. Load Graph
+    try:
+        gh = GraphHandler(args.graph_file, chunk_size=args.chunk_size)
+    except Exception as e:
+        print(f"Error loading graph: {e}")
+        return
+
+    # 3. Snapping koordinat ke Node ID terdekat
+    for name, coord in (("start", args.start_xy), ("target", args.target_xy)):
+        if coord is None:
+            continue
+        if not gh.pos:
+            print("[ERROR] Graf tidak memiliki koordinat (Edgelist). Gunakan Node ID dengan -S/-T.")
+            return
+        snapped = gh.snap_to_node(coord[0], coord[1], max_distance=args.snap_radius)
+        if snapped is None:
+            print(f"[ERROR] Tidak ada node dalam radius {args.snap_radius} dari koordinat {name} ({coord[0]}, {coord[1]}).")
+            return
+        node_id, dist = snapped
+        print(f"[SNAP] {name}: ({coord[0]:.2f}, {coord[1]:.2f}) -> Node {node_id} (jarak {dist:.2f})")
+        setattr(args, name, node_id)
+
+    # 4. LOGIKA MODE EKSEKUSI
+    from mibga import MIBGA
+
     all_nodes = gh.get_all_nodes()
     if args.start not in all_nodes:
         print(f"[ERROR] Start Node ID ({args.start}) tidak ditemukan di dalam data.")
@@ -184,6 +222,8 @@ def main():
     print("\n--- MIBGA Run Complete ---")
     if not final_paths:
         print("No paths found meeting criteria.")
+    elif args.headless:
+        print_paths(final_paths)
     else:
         # Panggil Visualisasi Plotly
         visualize_paths_plotly(gh, final_paths, all_candidates, args.start, args.target)
@@ -1,13 +1,18 @@
 import time
 import random
-from typing import List, Dict
-from graph_handler import GraphHandler
+import numpy as np
+from typing import List, Dict, Union, TYPE_CHECKING
 from path_solution import PathSolution
 from island import Island
+from operators import BridgeCache
 from analysis import find_kmdnsp
+from evaluation import BatchEvaluation, evaluate_batch
+
+if TYPE_CHECKING:
+    from graph_handler import GraphHandler
 
 class MIBGA:
-    def __init__(self, graph_handler: GraphHandler, S_node: int, T_node: int, K_paths: int, epsilon_threshold: float):
+    def __init__(self, graph_handler: 'GraphHandler', S_node: int, T_node: int, K_paths: int, epsilon_threshold: float):
         self.graph = graph_handler
         self.S_node = S_node
         self.T_node = T_node
@@ -20,30 +25,50 @@ class MIBGA:
         self.max_island_size = 15
         self.mutation_prob = 0.05
         self.timeout = 120 
+        self.bridge_cache_pairs = 5000
+        self.bridge_alternatives = 4
         
         self.start_time = 0.0
         self.shortest_path_len = 0.0
         self.initial_population: List[PathSolution] = []
         self.islands: List[Island] = []
-        self.all_found_paths: Dict[str, PathSolution] = {}
+        self.all_found_paths: Dict[Union[int, str], PathSolution] = {} # Key: hash 64-bit dari evaluate_batch
+        self.scored_weight_version = -1 # GraphHandler.weight_version yang dipakai untuk skor populasi saat ini
+        self.bridge_cache = BridgeCache(self.bridge_cache_pairs, self.bridge_alternatives)
+
+    def _max_allowed_length(self) -> float:
+        return self.shortest_path_len * (1.0 + self.epsilon)
+
+    def _archive_path(self, path_hash: int, path: PathSolution) -> bool:
+        """
+        Inserts a path into the archive under its batch hash. Returns True if the path was not archived yet.
+        """
+        existing = self.all_found_paths.get(path_hash)
+        if existing is not None and existing.nodes != path.nodes:
+            # Kolisi hash 64-bit (sangat jarang): simpan dengan hash string
+            existing = self.all_found_paths.get(path.get_hash())
+            self.all_found_paths[path.get_hash()] = path
+            return existing is None
+        self.all_found_paths[path_hash] = path
+        return existing is None
 
     def _initialize_population(self):
         print(f"Initializing population ({self.pop_size})...")
         attempts = 0
         while len(self.initial_population) < self.pop_size and attempts < self.pop_size * 50:
-            p = PathSolution.create_random_path(self.S_node, self.T_node, self.graph)
-            
-            if p is None:
+            batch = []
+            for _ in range(self.pop_size - len(self.initial_population)):
+                p = PathSolution.create_random_path(self.S_node, self.T_node, self.graph)
                 attempts += 1
-                continue
+                if p is not None:
+                    batch.append(p)
 
-            p.calculate_length()
-            p.calculate_fitness()
-            
-            if p.length != float('inf') and p.get_hash() not in self.all_found_paths:
-                self.initial_population.append(p)
-                self.all_found_paths[p.get_hash()] = p
-            attempts += 1
+            evaluation = evaluate_batch(batch, self.graph, self._max_allowed_length())
+            for p, path_hash in zip(batch, evaluation.hashes.tolist()):
+                if p.length == float('inf') or path_hash in self.all_found_paths:
+                    continue
+                if self._archive_path(path_hash, p):
+                    self.initial_population.append(p)
             
         if len(self.initial_population) == 0:
             print("[CRITICAL] Could not create any valid path. Start/Target might be disconnected.")
@@ -101,11 +126,16 @@ class MIBGA:
             source_idx = indices[i]
             island.P_sp = original_sps[source_idx]
 
-    def _selection_avgislandfit(self, all_offspring_by_island: List[List[PathSolution]]):
+    def _selection_avgislandfit(self, offspring: List[PathSolution], offspring_idx_by_island: List[np.ndarray], evaluation: BatchEvaluation):
+        """
+        `offspring_idx_by_island[i]` holds the indices (into `offspring` and the `evaluation` arrays)
+        of island i's valid children. Filtering and de-duplication use the batch fitness and hash arrays.
+        """
         new_islands = []
+        hashes = evaluation.hashes.tolist()
 
         for i, island in enumerate(self.islands):
-            offspring = all_offspring_by_island[i]
+            offspring_idx = offspring_idx_by_island[i]
             
             island_parents = island.P_sp + island.P_cp
             if not island_parents:
@@ -113,10 +143,11 @@ class MIBGA:
             else:
                 avg_island_fit = sum(p.fitness for p in island_parents) / len(island_parents)
             
-            valid_offspring = [o for o in offspring if o.fitness >= avg_island_fit]
+            selected_idx = offspring_idx[evaluation.fitness[offspring_idx] >= avg_island_fit]
 
-            combined_pool = island.P_sp + island.P_cp + valid_offspring
-            unique_map = {p.get_hash(): p for p in combined_pool}
+            unique_map = {p.path_hash: p for p in island_parents}
+            for j in selected_idx.tolist():
+                unique_map[hashes[j]] = offspring[j]
             unique_pool = list(unique_map.values())
             
             sorted_pool = sorted(unique_pool, key=lambda x: x.fitness, reverse=True)
@@ -155,46 +186,102 @@ class MIBGA:
 
         self.islands = new_islands
 
-    def _check_termination(self) -> bool:
-        return (time.time() - self.start_time) > self.timeout
+    def _check_termination(self, timeout: float) -> bool:
+        return (time.time() - self.start_time) > timeout
 
-    def run(self):
-        self.start_time = time.time()
-        
-        self.shortest_path_len = self.graph.get_shortest_path_length(self.S_node, self.T_node)
-        print(f"Shortest Path Length: {self.shortest_path_len}")
-        if self.shortest_path_len == float('inf'):
-            print("Target unreachable.")
-            return [], []
+    def _rescore_population(self):
+        """
+        Re-scores the archive and all island members in bulk after edge-weight changes and
+        drops paths that are no longer epsilon-feasible. Islands left empty are removed.
+        """
+        max_allowed = self._max_allowed_length()
 
-        self._initialize_population()
-        self._island_formation()
+        archive_keys = list(self.all_found_paths.keys())
+        archive_paths = list(self.all_found_paths.values())
+        evaluation = evaluate_batch(archive_paths, self.graph, max_allowed)
+        self.all_found_paths = {
+            key: p for key, p, ok in zip(archive_keys, archive_paths, evaluation.feasible.tolist()) if ok
+        }
+        print(f"Re-scored {len(archive_paths)} archived paths, {len(self.all_found_paths)} still feasible.")
+
+        # Anggota pulau dievaluasi ulang dalam satu batch (bisa berbeda objek dari entri arsip)
+        members = [p for island in self.islands for p in island.P_sp + island.P_cp]
+        feasible = evaluate_batch(members, self.graph, max_allowed).feasible.tolist()
+        feasible_ids = {id(p) for p, ok in zip(members, feasible) if ok}
+
+        surviving_islands = []
+        for island in self.islands:
+            island.P_sp = [p for p in island.P_sp if id(p) in feasible_ids]
+            island.P_cp = [p for p in island.P_cp if id(p) in feasible_ids]
+            if not island.P_sp and not island.P_cp:
+                continue
+            if not island.P_sp:
+                island.P_cp.sort(key=lambda x: x.fitness, reverse=True)
+                island.P_sp = [island.P_cp.pop(0)]
+            surviving_islands.append(island)
+        self.islands = surviving_islands
+
+    def _refill_islands(self):
+        """
+        Keeps only islands that can still breed (non-empty P_sp and P_cp).
+        An island with an empty central population is refilled with random feasible archive paths.
+        """
+        archive = list(self.all_found_paths.values())
+        breeding_islands = []
+        for island in self.islands:
+            if island.P_sp and not island.P_cp:
+                members = {p.path_hash for p in island.P_sp}
+                candidates = [p for p in archive if p.path_hash not in members]
+                refill_size = max(1, self.min_island_size - len(island.P_sp))
+                island.P_cp = random.sample(candidates, min(refill_size, len(candidates)))
+            if island.P_sp and island.P_cp:
+                breeding_islands.append(island)
+        print(f"{len(breeding_islands)} of {len(self.islands)} islands can breed after re-scoring.")
+        self.islands = breeding_islands
 
+    def _evolve(self, timeout: float):
         generation = 0
-        while not self._check_termination():
+        total_offspring = 0
+        while not self._check_termination(timeout):
             self._migration()
             
-            all_offspring_by_island = []
-            for island in self.islands:
-                offspring = island.generate_offspring(self.graph, self.mutation_prob)
-                
-                valid_offspring = []
-                for child in offspring:
-                    child.calculate_length()
-                    child.calculate_fitness()
-                    if child.length != float('inf'):
-                        self.all_found_paths[child.get_hash()] = child
-                        valid_offspring.append(child)
-                all_offspring_by_island.append(valid_offspring)
-            
-            self._selection_avgislandfit(all_offspring_by_island)
+            offspring_by_island = [
+                island.generate_offspring(self.graph, self.mutation_prob, self.bridge_cache)
+                for island in self.islands
+            ]
+
+            # Evaluasi seluruh keturunan satu generasi sekaligus
+            all_offspring = [child for offspring in offspring_by_island for child in offspring]
+            total_offspring += len(all_offspring)
+            evaluation = evaluate_batch(all_offspring, self.graph, self._max_allowed_length())
+            is_valid = np.isfinite(evaluation.lengths)
+            hashes = evaluation.hashes.tolist()
+
+            offspring_idx_by_island = []
+            start = 0
+            for offspring in offspring_by_island:
+                end = start + len(offspring)
+                valid_idx = np.flatnonzero(is_valid[start:end]) + start
+                for j in valid_idx.tolist():
+                    self._archive_path(hashes[j], all_offspring[j])
+                offspring_idx_by_island.append(valid_idx)
+                start = end
+            
+            self._selection_avgislandfit(all_offspring, offspring_idx_by_island, evaluation)
             
             generation += 1
             if generation % 10 == 0:
-                print(f"Gen {generation} | Unique Paths: {len(self.all_found_paths)} | Islands: {len(self.islands)}")
+                cache_stats = self.bridge_cache.stats()
+                print(f"Gen {generation} | Unique Paths: {len(self.all_found_paths)} | Islands: {len(self.islands)} | Bridge Cache Hit: {cache_stats['hit_rate']:.1%}")
 
+        print(f"Generations: {generation} | Offspring evaluated: {total_offspring}")
+        cache_stats = self.bridge_cache.stats()
+        print(f"Bridge cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['bridges']} bridges over {cache_stats['pairs']} pairs.")
         print("Analyzing K-Most Diverse...")
         
+        return self._finalize()
+
+    def _finalize(self):
         all_candidates = list(self.all_found_paths.values())
         
         final_paths = find_kmdnsp(
@@ -203,4 +290,52 @@ class MIBGA:
             shortest_path_len=self.shortest_path_len,
             epsilon=self.epsilon
         )
-        return all_candidates, final_paths
\ No newline at end of file
+        return all_candidates, final_paths
+
+    def run(self):
+        self.start_time = time.time()
+        self.scored_weight_version = self.graph.weight_version
+        
+        self.shortest_path_len = self.graph.get_shortest_path_length(self.S_node, self.T_node)
+        print(f"Shortest Path Length: {self.shortest_path_len}")
+        if self.shortest_path_len == float('inf'):
+            print("Target unreachable.")
+            return [], []
+
+        self._initialize_population()
+        self._island_formation()
+        return self._evolve(self.timeout)
+
+    def rerun(self, time_fraction: float = 0.25):
+        """
+        Warm re-run after GraphHandler.update_edge_weights.
+        Resumes evolution from the surviving islands for `time_fraction` of the original timeout.
+        """
+        if not self.islands:
+            return self.run()
+        if self.graph.weight_version == self.scored_weight_version:
+            print("No edge-weight changes since the last run, returning current result.")
+            return self._finalize()
+
+        self.start_time = time.time()
+        self.scored_weight_version = self.graph.weight_version
+
+        self.shortest_path_len = self.graph.get_shortest_path_length(self.S_node, self.T_node)
+        print(f"Shortest Path Length: {self.shortest_path_len}")
+        if self.shortest_path_len == float('inf'):
+            print("Target unreachable.")
+            return [], []
+
+        self._rescore_population()
+        self._refill_islands()
+        self.bridge_cache.refresh_lengths(self.graph)
+
+        if not self.islands:
+            # Bentuk ulang pulau dari arsip yang masih feasible; random walk hanya untuk mengisi kekurangan
+            survivors = sorted(self.all_found_paths.values(), key=lambda x: x.fitness, reverse=True)
+            self.initial_population = survivors[:self.pop_size]
+            print(f"No island can breed after the update, re-forming islands from {len(self.initial_population)} archived paths.")
+            self._initialize_population()
+            self._island_formation()
+
+        return self._evolve(self.timeout * time_fraction)
\ No newline at end of file
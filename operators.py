@@ -1,14 +1,125 @@
-from typing import Tuple, TYPE_CHECKING
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from collections import OrderedDict
 import random
 
 if TYPE_CHECKING:
     from path_solution import PathSolution
     from graph_handler import GraphHandler
 
-def lfpc_crossover(parent_A: 'PathSolution', parent_B: 'PathSolution', graph_handler: 'GraphHandler') -> Tuple['PathSolution', 'PathSolution']:
+class BridgeCache:
+    """
+    Bounded LRU cache of successful random-walk bridges, keyed by (start, end).
+    Each pair keeps up to `max_alternatives` distinct bridges so reuse does not collapse diversity.
+    Pairs with fewer distinct bridges are marked saturated after a repeated bridge or `max_walks` walks.
+    """
+    def __init__(self, max_pairs: int = 5000, max_alternatives: int = 4, max_walks: Optional[int] = None):
+        self.max_pairs = max_pairs
+        self.max_alternatives = max_alternatives
+        self.max_walks = max_walks if max_walks is not None else 2 * max_alternatives
+        self._bridges: 'OrderedDict[Tuple[int, int], List[Tuple[Tuple[int, ...], float]]]' = OrderedDict()
+        self._walks: Dict[Tuple[int, int], int] = {} # Jumlah random walk per pasangan
+        self._saturated = set() # Pasangan yang tidak lagi menghasilkan bridge baru
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_bridge(self, start: int, end: int, graph_handler: 'GraphHandler') -> Optional[List[int]]:
+        """
+        Returns the node list of a bridge start -> end.
+        A fresh random walk is made until the pair holds `max_alternatives` bridges or is saturated,
+        after that a random cached alternative is reused.
+        """
+        from path_solution import PathSolution
+
+        key = (start, end)
+        alternatives = self._bridges.get(key)
+        if alternatives is not None:
+            self._bridges.move_to_end(key)
+            if len(alternatives) >= self.max_alternatives or key in self._saturated:
+                self.hits += 1
+                return list(random.choice(alternatives)[0])
+
+        self.misses += 1
+        bridge = PathSolution.create_random_path(start, end, graph_handler)
+        if bridge is None:
+            return None
+
+        nodes = tuple(bridge.nodes)
+        if alternatives is None:
+            alternatives = []
+            self._bridges[key] = alternatives
+            if len(self._bridges) > self.max_pairs:
+                evicted, _ = self._bridges.popitem(last=False)
+                self._walks.pop(evicted, None)
+                self._saturated.discard(evicted)
+                self.evictions += 1
+
+        walks = self._walks.get(key, 0) + 1
+        self._walks[key] = walks
+        if all(nodes != cached for cached, _ in alternatives):
+            bridge.calculate_length()
+            alternatives.append((nodes, bridge.length))
+            if walks >= self.max_walks:
+                self._saturated.add(key)
+        else:
+            # Walk mengulang bridge yang sudah ada: pasangan ini dianggap jenuh
+            self._saturated.add(key)
+        return bridge.nodes
+
+    def bridge_lengths(self, start: int, end: int) -> List[float]:
+        # Panjang semua alternatif bridge yang tersimpan untuk pasangan (start, end)
+        return [length for _, length in self._bridges.get((start, end), [])]
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            'pairs': len(self._bridges),
+            'bridges': sum(len(alts) for alts in self._bridges.values()),
+            'saturated': len(self._saturated),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def refresh_lengths(self, graph_handler: 'GraphHandler') -> None:
+        # Dipanggil setelah bobot edge berubah; bridge yang melewati edge terputus (inf) dibuang
+        for key in list(self._bridges):
+            refreshed = []
+            for nodes, _ in self._bridges[key]:
+                length = sum(graph_handler.get_edge_length(u, v) for u, v in zip(nodes[:-1], nodes[1:]))
+                if length != float('inf'):
+                    refreshed.append((nodes, length))
+            if len(refreshed) < len(self._bridges[key]):
+                # Ada bridge yang dibuang: izinkan pasangan ini mencari alternatif baru
+                self._walks.pop(key, None)
+                self._saturated.discard(key)
+            if refreshed:
+                self._bridges[key] = refreshed
+            else:
+                del self._bridges[key]
+
+    def clear(self) -> None:
+        self._bridges.clear()
+        self._walks.clear()
+        self._saturated.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+def _make_bridge(start: int, end: int, graph_handler: 'GraphHandler', bridge_cache: Optional[BridgeCache]) -> Optional[List[int]]:
+    from path_solution import PathSolution
+
+    if bridge_cache is not None:
+        return bridge_cache.get_bridge(start, end, graph_handler)
+    bridge = PathSolution.create_random_path(start, end, graph_handler)
+    return bridge.nodes if bridge is not None else None
+
+def lfpc_crossover(parent_A: 'PathSolution', parent_B: 'PathSolution', graph_handler: 'GraphHandler', bridge_cache: Optional[BridgeCache] = None) -> Tuple['PathSolution', 'PathSolution']:
     """
     Implements Loop-Free Path-Composer (LFPC) Crossover.
     Does NOT rely on common nodes. Bridges a random node in A to a random node in B.
+    Bridges are taken from `bridge_cache` when one is given.
     """
     # Import lokal untuk menghindari circular import saat runtime
     from path_solution import PathSolution
@@ -24,7 +135,7 @@ def lfpc_crossover(parent_A: 'PathSolution', parent_B: 'PathSolution', graph_han
     node_b = parent_B.nodes[idx_b]
 
     # 2. Create partial route (bridge) from R(A) to R(B)
-    bridge_path = PathSolution.create_random_path(node_a, node_b, graph_handler)
+    bridge_path = _make_bridge(node_a, node_b, graph_handler, bridge_cache)
     
     # --- PERBAIKAN: Cek jika bridging gagal ---
     if bridge_path is None:
@@ -33,27 +144,27 @@ def lfpc_crossover(parent_A: 'PathSolution', parent_B: 'PathSolution', graph_han
     # ------------------------------------------
 
     # 3. Stitch: S->R(A) + Bridge + R(B)->T
-    new_nodes = parent_A.nodes[:idx_a] + bridge_path.nodes + parent_B.nodes[idx_b+1:]
+    new_nodes = parent_A.nodes[:idx_a] + bridge_path + parent_B.nodes[idx_b+1:]
     
     child_1 = PathSolution(new_nodes, graph_handler)
     child_1.mend_path() 
 
     # Generate second child (symmetric or random bridge B->A)
-    bridge_back = PathSolution.create_random_path(node_b, node_a, graph_handler)
+    bridge_back = _make_bridge(node_b, node_a, graph_handler, bridge_cache)
     
     # --- PERBAIKAN: Cek jika bridging balik gagal ---
     if bridge_back is None:
         # Jika anak kedua gagal, kita bisa kembalikan parent_B aslinya
         child_2 = parent_B
     else:
-        new_nodes_2 = parent_B.nodes[:idx_b] + bridge_back.nodes + parent_A.nodes[idx_a+1:]
+        new_nodes_2 = parent_B.nodes[:idx_b] + bridge_back + parent_A.nodes[idx_a+1:]
         child_2 = PathSolution(new_nodes_2, graph_handler)
         child_2.mend_path()
     # ------------------------------------------------
 
     return child_1, child_2
 
-def lfpc_mutation(parent_A: 'PathSolution', parent_B: 'PathSolution', graph_handler: 'GraphHandler') -> Tuple['PathSolution', 'PathSolution']:
+def lfpc_mutation(parent_A: 'PathSolution', parent_B: 'PathSolution', graph_handler: 'GraphHandler', bridge_cache: Optional[BridgeCache] = None) -> Tuple['PathSolution', 'PathSolution']:
     """
     Implements LFPC with Mutation.
     Mutates R(A) to a neighbor R(C) before bridging.
@@ -63,7 +174,7 @@ def lfpc_mutation(parent_A: 'PathSolution', parent_B: 'PathSolution', graph_hand
     # 1. Check valid length
     if len(parent_A.nodes) < 3:
         # Fallback if path too short for mutation logic
-        return lfpc_crossover(parent_A, parent_B, graph_handler)
+        return lfpc_crossover(parent_A, parent_B, graph_handler, bridge_cache)
 
     idx_a = random.randint(1, len(parent_A.nodes) - 2) # Ensure predecessor exists
     if len(parent_B.nodes) < 2:
@@ -77,26 +188,26 @@ def lfpc_mutation(parent_A: 'PathSolution', parent_B: 'PathSolution', graph_hand
     # 2. Select R(C): A random neighbor of the node preceding R(A)
     neighbors = graph_handler.get_neighbors(node_preceding)
     if not neighbors:
-        return lfpc_crossover(parent_A, parent_B, graph_handler)
+        return lfpc_crossover(parent_A, parent_B, graph_handler, bridge_cache)
         
     node_c = random.choice(neighbors) # Replaces original R(A)
 
     # 3. Create Bridge R(C) -> R(B)
-    bridge_path = PathSolution.create_random_path(node_c, node_b, graph_handler)
+    bridge_path = _make_bridge(node_c, node_b, graph_handler, bridge_cache)
 
     # --- PERBAIKAN: Cek jika bridging mutation gagal ---
     if bridge_path is None:
         # Jika mutasi gagal (jalan buntu), lakukan crossover biasa sebagai fallback
-        return lfpc_crossover(parent_A, parent_B, graph_handler)
+        return lfpc_crossover(parent_A, parent_B, graph_handler, bridge_cache)
     # ---------------------------------------------------
 
     # 4. Stitch: S...Preceding + Bridge(starts with C) + ...T
-    new_nodes = parent_A.nodes[:idx_a] + bridge_path.nodes + parent_B.nodes[idx_b+1:]
+    new_nodes = parent_A.nodes[:idx_a] + bridge_path + parent_B.nodes[idx_b+1:]
     
     child_1 = PathSolution(new_nodes, graph_handler)
     child_1.mend_path()
 
     # Child 2: Return a standard crossover or mutation on B to maintain API
-    child_2, _ = lfpc_crossover(parent_B, parent_A, graph_handler)
+    child_2, _ = lfpc_crossover(parent_B, parent_A, graph_handler, bridge_cache)
     
     return child_1, child_2
\ No newline at end of file
@@ -8,6 +8,7 @@ class PathSolution:
         self.nodes = nodes
         self.length = 0.0
         self.fitness = 0.0
+        self.path_hash: Optional[int] = None # Hash 64-bit, diisi oleh evaluation.evaluate_batch
 
     def mend_path(self) -> None:
         # Implementasi Mending Function
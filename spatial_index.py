@@ -0,0 +1,114 @@
+import heapq
+import math
+from typing import Dict, List, Optional, Tuple
+
+class KDTreeIndex:
+    """
+    KD-tree over node coordinates for nearest-node and radius queries.
+    Nodes are split at the median of the wider axis, so dense clusters get deeper subtrees
+    instead of overcrowded cells. Queries prune subtrees by the distance from the query
+    point to their bounding box, which also holds for points outside the data extent.
+    """
+    def __init__(self, pos: Dict[int, Tuple[float, float]], leaf_size: int = 16):
+        import numpy as np
+
+        self.pos = pos
+        self.leaf_size = leaf_size
+        self._boxes: List[Tuple[float, float, float, float]] = [] # (min_x, min_y, max_x, max_y) per tree node
+        self._children: List[Optional[Tuple[int, int]]] = []
+        self._leaves: List[Optional[List[Tuple[int, float, float]]]] = [] # (node_id, x, y) untuk leaf
+        self._root: Optional[int] = None
+
+        if pos:
+            ids = np.fromiter(pos.keys(), dtype=np.int64, count=len(pos))
+            coords = np.array(list(pos.values()), dtype=np.float64).reshape(-1, 2)
+            self._root = self._build(ids, coords)
+
+    def _build(self, ids, coords) -> int:
+        import numpy as np
+
+        node = len(self._boxes)
+        mins = coords.min(axis=0).tolist()
+        maxs = coords.max(axis=0).tolist()
+        self._boxes.append((mins[0], mins[1], maxs[0], maxs[1]))
+        self._children.append(None)
+        self._leaves.append(None)
+
+        if len(ids) <= self.leaf_size:
+            self._leaves[node] = list(zip(ids.tolist(), coords[:, 0].tolist(), coords[:, 1].tolist()))
+            return node
+
+        # Split di median sumbu terlebar (dihitung berdasarkan jumlah titik, aman untuk koordinat duplikat)
+        dim = 0 if maxs[0] - mins[0] >= maxs[1] - mins[1] else 1
+        mid = len(ids) // 2
+        order = np.argpartition(coords[:, dim], mid)
+        ids, coords = ids[order], coords[order]
+
+        left = self._build(ids[:mid], coords[:mid])
+        right = self._build(ids[mid:], coords[mid:])
+        self._children[node] = (left, right)
+        return node
+
+    def _box_dist2(self, node: int, x: float, y: float) -> float:
+        # Jarak kuadrat dari (x, y) ke bounding box node (0 jika di dalam box)
+        min_x, min_y, max_x, max_y = self._boxes[node]
+        dx = min_x - x if x < min_x else (x - max_x if x > max_x else 0.0)
+        dy = min_y - y if y < min_y else (y - max_y if y > max_y else 0.0)
+        return dx * dx + dy * dy
+
+    def nearest(self, x: float, y: float) -> Optional[Tuple[int, float]]:
+        """
+        Returns (node_id, distance) of the node closest to (x, y), or None if the index is empty.
+        """
+        if self._root is None:
+            return None
+
+        best_node, best_d2 = None, float('inf')
+        # Best-first: subtree dengan batas bawah jarak terkecil diproses lebih dulu
+        heap = [(self._box_dist2(self._root, x, y), self._root)]
+        while heap:
+            bound, node = heapq.heappop(heap)
+            if bound >= best_d2:
+                break
+
+            leaf = self._leaves[node]
+            if leaf is not None:
+                for node_id, px, py in leaf:
+                    d2 = (px - x) * (px - x) + (py - y) * (py - y)
+                    if d2 < best_d2:
+                        best_node, best_d2 = node_id, d2
+                continue
+
+            for child in self._children[node]:
+                child_bound = self._box_dist2(child, x, y)
+                if child_bound < best_d2:
+                    heapq.heappush(heap, (child_bound, child))
+
+        return best_node, math.sqrt(best_d2)
+
+    def within_radius(self, x: float, y: float, radius: float) -> List[Tuple[int, float]]:
+        """
+        Returns all (node_id, distance) within `radius` of (x, y), sorted by distance.
+        """
+        if self._root is None or radius < 0:
+            return []
+
+        r2 = radius * radius
+        result = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if self._box_dist2(node, x, y) > r2:
+                continue
+
+            leaf = self._leaves[node]
+            if leaf is not None:
+                for node_id, px, py in leaf:
+                    d2 = (px - x) * (px - x) + (py - y) * (py - y)
+                    if d2 <= r2:
+                        result.append((node_id, math.sqrt(d2)))
+            else:
+                stack.extend(self._children[node])
+
+        result.sort(key=lambda item: item[1])
+        return result
\ No newline at end of file